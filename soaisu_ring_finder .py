@@ -86,124 +86,144 @@ def get_unique_cyclic_and_reversed_arrangements(permutations_list):
         
     return list(unique_arrangements)
 
+def build_disjointness_graph(members):
+    """
+    Builds the pairwise disjointness graph for a group of sets.
+    Returns one bitmask per member; bit j of entry i is set when
+    members i and j share no elements.
+    """
+    adjacency = [0] * len(members)
+    for i in range(len(members)):
+        for j in range(i + 1, len(members)):
+            if members[i].isdisjoint(members[j]):
+                adjacency[i] |= 1 << j
+                adjacency[j] |= 1 << i
+    return adjacency
+
+def arrangement_invariants(arrangement):
+    """
+    Returns the ring invariants of a 6-element arrangement:
+    (cyclic product sums m=1 to 5, diagonal product sum, regular triangle product sum).
+    """
+    cyclic_sums = tuple(cyclic_product_sum(arrangement, m) for m in range(1, 6))
+    return cyclic_sums, diagonal_product_sum(arrangement), regular_triangle_product_sum(arrangement)
+
 # --- Main Program Logic ---
 
 def find_soaisu_rings_in_range(n_limit):
     """
     Searches for 6-6 SOAISU heart heart heart heart heart ring pairs within the range 1 to n_limit.
+    6-sets sharing the same power sums are reported as one group (multigrade family),
+    and ring checking runs once per group instead of once per pair.
     """
     print(f"--- Step 1: Searching for 6-6 SOAISU (PTE Ideal Solutions) within 1 to {n_limit} ---")
     print("WARNING: This step can be extremely time-consuming for large n_limit due to combinatorial explosion.")
     print("For n_limit > 25, it might take hours or days.")
     
     all_numbers = list(range(1, n_limit + 1))
-    soaisu_solutions = []
     
-    # Generate all combinations of 6 numbers for S1
-    s1_combinations = list(itertools.combinations(all_numbers, 6))
-    total_s1_comb = len(s1_combinations)
+    # Bucket every 6-set by its power sums (k=0 to 5); each combination is visited once
+    total_s1_comb = math.comb(len(all_numbers), 6)
     print(f"Total S1 combinations to check: {total_s1_comb}")
 
     start_time_step1 = time.time()
     s1_count = 0
+    signature_buckets = {}
     
-    for s1_candidate_tuple in s1_combinations:
+    for s_candidate_tuple in itertools.combinations(all_numbers, 6):
         s1_count += 1
-        s1_candidate = set(s1_candidate_tuple)
-        s1_power_sums = calculate_power_sums(s1_candidate, 5)
-
-        # Optimization: Only consider S2 combinations from numbers not in S1
-        remaining_numbers = [x for x in all_numbers if x not in s1_candidate]
-        if len(remaining_numbers) < 6:
-            continue # Not enough numbers left for S2
-
-        s2_combinations = list(itertools.combinations(remaining_numbers, 6))
-        
-        for s2_candidate_tuple in s2_combinations:
-            s2_candidate = set(s2_candidate_tuple)
-            s2_power_sums = calculate_power_sums(s2_candidate, 5)
-
-            # Check if power sums match for k=0 to 5
-            if s1_power_sums == s2_power_sums:
-                soaisu_solutions.append((s1_candidate, s2_candidate))
-                print(f"  Found 6-6 SOAISU: S1={s1_candidate}, S2={s2_candidate}")
+        power_sums = calculate_power_sums(s_candidate_tuple, 5)
+        bucket = signature_buckets.get(power_sums)
+        if bucket is None:
+            signature_buckets[power_sums] = s_candidate_tuple
+        elif isinstance(bucket, list):
+            bucket.append(s_candidate_tuple)
+        else:
+            signature_buckets[power_sums] = [bucket, s_candidate_tuple]
         
         if s1_count % 1000 == 0:
             elapsed_time = time.time() - start_time_step1
             print(f"  Processed {s1_count}/{total_s1_comb} S1 combinations. Elapsed: {elapsed_time:.2f}s")
 
-    if not soaisu_solutions:
+    # Keep only groups containing at least one disjoint pair
+    soaisu_groups = []
+    for bucket in signature_buckets.values():
+        if not isinstance(bucket, list):
+            continue
+        members = [set(s) for s in bucket]
+        adjacency = build_disjointness_graph(members)
+        if any(adjacency):
+            soaisu_groups.append((members, adjacency))
+            print(f"  Found 6-6 SOAISU group of {len(members)} sets: {members}")
+    signature_buckets = None
+
+    if not soaisu_groups:
         print("  No 6-6 SOAISU found within the specified range.")
         return
 
-    print(f"\n--- Step 1 Complete: Found {len(soaisu_solutions)} 6-6 SOAISU pairs ---")
+    total_pairs = sum(bin(mask).count("1") for _, adjacency in soaisu_groups for mask in adjacency) // 2
+    print(f"\n--- Step 1 Complete: Found {len(soaisu_groups)} 6-6 SOAISU groups ({total_pairs} disjoint pairs) ---")
 
     print("\n--- Step 2, 3, 4: Checking for SOAISU Rings ---")
-    soaisu_ring_pairs = []
+    soaisu_ring_groups = []
 
-    for s1_set, s2_set in soaisu_solutions:
-        print(f"\nProcessing SOAISU pair: S1={s1_set}, S2={s2_set}")
-        
-        # Step 2: Find arrangements with matching cyclic product sums (1st to 5th)
-        all_s1_permutations = list(itertools.permutations(s1_set))
-        all_s2_permutations = list(itertools.permutations(s2_set))
+    for members, adjacency in soaisu_groups:
+        print(f"\nProcessing SOAISU group: {members}")
         
-        unique_s1_arrangements = get_unique_cyclic_and_reversed_arrangements(all_s1_permutations)
-        unique_s2_arrangements = get_unique_cyclic_and_reversed_arrangements(all_s2_permutations)
+        # Step 2: Join all members' arrangements on their 1-5 cyclic product sums
+        cyclic_buckets = {}
+        for index, member in enumerate(members):
+            unique_arrangements = get_unique_cyclic_and_reversed_arrangements(itertools.permutations(member))
+            for arrangement in unique_arrangements:
+                cyclic_sums, diag_sum, tri_sum = arrangement_invariants(arrangement)
+                cyclic_buckets.setdefault(cyclic_sums, []).append((index, arrangement, diag_sum, tri_sum))
         
-        found_cyclic_match_for_pair = False # Flag for current S1, S2 pair
+        found_cyclic_match_for_group = False # Flag for current group
         
-        for perm1 in unique_s1_arrangements:
-            for perm2 in unique_s2_arrangements:
-                
-                # Check 1st to 5th cyclic product sums
-                cyclic_sums_match = True
-                for m in range(1, 6): # m=1 to 5
-                    sum1 = cyclic_product_sum(perm1, m)
-                    sum2 = cyclic_product_sum(perm2, m)
-                    
-                    if sum1 != sum2:
-                        cyclic_sums_match = False
-                        break
-                
-                if cyclic_sums_match:
-                    found_cyclic_match_for_pair = True
-                    print(f"  Found matching cyclic product sums for arrangements:")
-                    print(f"    S1 arrangement: {perm1}")
-                    print(f"    S2 arrangement: {perm2}")
-
-                    # Step 3: Check Diagonal Product Sum
-                    diag_sum1 = diagonal_product_sum(perm1)
-                    diag_sum2 = diagonal_product_sum(perm2)
-                    
-                    if diag_sum1 == diag_sum2:
-                        print(f"  Diagonal product sums match: {diag_sum1}")
-
-                        # Step 4: Check Regular Triangle Product Sum
-                        tri_sum1 = regular_triangle_product_sum(perm1)
-                        tri_sum2 = regular_triangle_product_sum(perm2)
-                        
-                        if tri_sum1 == tri_sum2:
-                            print(f"  Regular triangle product sums match: {tri_sum1}")
-                            soaisu_ring_pairs.append((perm1, perm2))
-                            print(f"  >>> Found 6-6 SOAISU heart heart heart heart heart Ring Pair! <<<")
-                        else:
-                            print(f"  Regular triangle product sums DO NOT match. S1: {tri_sum1}, S2: {tri_sum2}")
-                    else:
-                        print(f"  Diagonal product sums DO NOT match. S1: {diag_sum1}, S2: {diag_sum2}")
+        for cyclic_sums, entries in cyclic_buckets.items():
+            member_mask = 0
+            for index, _, _, _ in entries:
+                member_mask |= 1 << index
+            if not any(adjacency[index] & member_mask for index, _, _, _ in entries):
+                continue
+            
+            found_cyclic_match_for_group = True
+            print(f"  Found matching cyclic product sums {list(cyclic_sums)} for arrangements:")
+            for index, arrangement, _, _ in entries:
+                print(f"    Set {index} arrangement: {arrangement}")
+
+            # Steps 3 and 4: Split the matches by diagonal and regular triangle product sums
+            product_buckets = {}
+            for index, arrangement, diag_sum, tri_sum in entries:
+                product_buckets.setdefault((diag_sum, tri_sum), []).append((index, arrangement))
+            
+            for (diag_sum, tri_sum), ring_entries in product_buckets.items():
+                ring_mask = 0
+                for index, _ in ring_entries:
+                    ring_mask |= 1 << index
+                if any(adjacency[index] & ring_mask for index, _ in ring_entries):
+                    print(f"  Diagonal product sums match: {diag_sum}")
+                    print(f"  Regular triangle product sums match: {tri_sum}")
+                    soaisu_ring_groups.append([arrangement for _, arrangement in ring_entries])
+                    print(f"  >>> Found 6-6 SOAISU heart heart heart heart heart Ring group of {len(ring_entries)} arrangements! <<<")
+            
+            if len(product_buckets) > 1:
+                print(f"  Diagonal/regular triangle product sums split these arrangements into: {sorted(product_buckets)}")
                 
-        if not found_cyclic_match_for_pair:
-            print(f"  No arrangements with matching 1-5 cyclic product sums found for S1={s1_set}, S2={s2_set}")
+        if not found_cyclic_match_for_group:
+            print(f"  No arrangements with matching 1-5 cyclic product sums found for group {members}")
 
-    if not soaisu_ring_pairs:
+    if not soaisu_ring_groups:
         print("\n--- Step 2, 3, 4 Complete: No 6-6 SOAISU heart heart heart heart heart Ring pairs found. ---")
     else:
-        print(f"\n--- Step 2, 3, 4 Complete: Found {len(soaisu_ring_pairs)} 6-6 SOAISU heart heart heart heart heart Ring pairs. ---")
-        print("\n--- All 6-6 SOAISU heart heart heart heart heart Ring Pairs Found: ---")
-        for i, (p1, p2) in enumerate(soaisu_ring_pairs):
-            print(f"Pair {i+1}:")
-            print(f"  S1: {p1}")
-            print(f"  S2: {p2}")
+        print(f"\n--- Step 2, 3, 4 Complete: Found {len(soaisu_ring_groups)} 6-6 SOAISU heart heart heart heart heart Ring groups. ---")
+        print("\n--- All 6-6 SOAISU heart heart heart heart heart Ring Groups Found: ---")
+        print("Any two arrangements of disjoint sets within a group form a ring pair.")
+        for i, ring_group in enumerate(soaisu_ring_groups):
+            p1 = ring_group[0]
+            print(f"Group {i+1}:")
+            for j, arrangement in enumerate(ring_group):
+                print(f"  S{j+1}: {arrangement}")
             print(f"  Cyclic Product Sums (m=1 to 5):")
             for m in range(1, 6):
                 print(f"    m={m}: {cyclic_product_sum(p1, m)}")